@@ -1,200 +1,465 @@
 import argparse
+import hashlib
+import math
+import mmap
+import pickle
+import re
+import numpy as np
 from PIL import Image
-from typing import List, Dict, Union, Tuple
+from typing import BinaryIO, Callable, Dict, Iterator, List, Optional, Tuple
 import os
 import sys
 
+from array import array
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass, field
-from typing import List, Optional, Union, Tuple
 
-
-@dataclass
-class Position:
-    x: float
-    y: float
-    z: float
+try:
+    from numba import njit, prange
+except ImportError:  # numba is optional, sampling falls back to plain NumPy without it
+    njit = None
 
 
 @dataclass
-class TexCoord:
-    u: float
-    v: float
+class OBJ:
+    # structure of arrays, one row per v / vt / vn line in file order
+    positions: np.ndarray = field(default_factory=lambda: np.empty((0, 3), np.float32))
+    texcoords: np.ndarray = field(default_factory=lambda: np.empty((0, 2), np.float32))
+    normals: np.ndarray = field(default_factory=lambda: np.empty((0, 3), np.float32))
+    # one (v, vt, vn) row per face vertex, zero based with -1 where an index is absent
+    face_vertices: np.ndarray = field(
+        default_factory=lambda: np.empty((0, 3), np.int32)
+    )
+    # face i is made of face_vertices[face_offsets[i]:face_offsets[i + 1]]
+    face_offsets: np.ndarray = field(default_factory=lambda: np.zeros(1, np.int64))
+    # flat indices into face_vertices of entries given as negative (relative) indices,
+    # resolved against the rows of their own range, _merge_chunks shifts them
+    face_relative: np.ndarray = field(default_factory=lambda: np.empty(0, np.int64))
+    # material id of every face, -1 for faces before any usemtl
+    face_materials: np.ndarray = field(default_factory=lambda: np.empty(0, np.int32))
+    # material name → id, in order of first use
+    materials: Dict[str, int] = field(default_factory=dict)
+    # changes throughout parsing, the active material will apply to newly created faces
+    current_material: int = -1
+    # rows of the arrays above filled in so far while parsing
+    num_positions: int = 0
+    num_texcoords: int = 0
+    num_normals: int = 0
+    # face data grows here while parsing and is moved into the arrays above once done
+    face_vertex_buffer: array = field(default_factory=lambda: array("i"))
+    face_offset_buffer: array = field(default_factory=lambda: array("q", [0]))
+    face_material_buffer: array = field(default_factory=lambda: array("i"))
+    face_relative_buffer: array = field(default_factory=lambda: array("q"))
+
+
+def _parse_position(obj: OBJ, rest: bytes) -> None:
+    parts = rest.split()
+    obj.positions[obj.num_positions] = (
+        float(parts[0]),
+        float(parts[1]),
+        float(parts[2]),
+    )
+    obj.num_positions += 1
 
 
-@dataclass
-class Normal:
-    x: float
-    y: float
-    z: float
+def _parse_texcoord(obj: OBJ, rest: bytes) -> None:
+    parts = rest.split()
+    obj.texcoords[obj.num_texcoords] = (float(parts[0]), float(parts[1]))
+    obj.num_texcoords += 1
 
 
-@dataclass
-class FaceVertex:
-    position_index: Optional[int] = None
-    texcoord_index: Optional[int] = None
-    normal_index: Optional[int] = None
+def _parse_normal(obj: OBJ, rest: bytes) -> None:
+    parts = rest.split()
+    obj.normals[obj.num_normals] = (float(parts[0]), float(parts[1]), float(parts[2]))
+    obj.num_normals += 1
 
 
-@dataclass
-class Face:
-    vertices: List[FaceVertex]  # structured indices
-    material: str  # material used
-    line: str = ""  # original face line (optional)
+def _parse_usemtl(obj: OBJ, rest: bytes) -> None:
+    name = rest.strip().decode()
+    obj.current_material = obj.materials.setdefault(name, len(obj.materials))
 
 
-@dataclass
-class OBJ:
-    positions: List[Position] = field(default_factory=list)
-    texcoords: List[TexCoord] = field(default_factory=list)
-    normals: List[Normal] = field(default_factory=list)
-    faces: List[Face] = field(default_factory=list)
-    out_lines: List[Union[Tuple[str, int], str]] = field(default_factory=list)
-    # changes throughout parsing, the active material will apply to newly created faces
-    current_material: str = ""
+# OBJ format: v/vt/vn or v//vn or v/vt or v
+_FACE_VERTEX_RE = re.compile(rb"(-?\d+)(?:/(-?\d*))?(?:/(-?\d+))?")
+_find_face_vertices = _FACE_VERTEX_RE.findall
 
 
-def parse_obj(file_path: str) -> OBJ:
-    obj = OBJ()
+def _extend_relative_face(obj: OBJ, rest: bytes) -> None:
+    """Append the vertices of a face that uses negative indices.
 
-    with open(file_path, "r") as f:
-        for line in f:
-            line_strip = line.strip()
-            if line.startswith("v "):
-                parts = line_strip.split()
-                pos = Position(float(parts[1]), float(parts[2]), float(parts[3]))
-                obj.positions.append(pos)
-                obj.out_lines.append(("v", len(obj.positions) - 1))
-            elif line.startswith("vt "):
-                parts = line_strip.split()
-                tex = TexCoord(float(parts[1]), float(parts[2]))
-                obj.texcoords.append(tex)
-                obj.out_lines.append(("vt", len(obj.texcoords) - 1))
-            elif line.startswith("vn "):
-                parts = line_strip.split()
-                norm = Normal(float(parts[1]), float(parts[2]), float(parts[3]))
-                obj.normals.append(norm)
-                obj.out_lines.append(("vn", len(obj.normals) - 1))
-            elif line_strip.lower().startswith("usemtl"):
-                obj.current_material = line_strip.split(None, 1)[1]
-                obj.out_lines.append(line)
-            elif line_strip.lower().startswith("f "):
-                face_vertices = []
-                for vert in line_strip.split()[1:]:
-                    # OBJ format: v/vt/vn or v//vn or v/vt or v
-                    v_idx, vt_idx, vn_idx = None, None, None
-                    parts = vert.split("/")
-                    if len(parts) >= 1 and parts[0]:
-                        v_idx = int(parts[0]) - 1
-                    if len(parts) >= 2 and parts[1]:
-                        vt_idx = int(parts[1]) - 1
-                    if len(parts) == 3 and parts[2]:
-                        vn_idx = int(parts[2]) - 1
-                    face_vertices.append(FaceVertex(v_idx, vt_idx, vn_idx))
-
-                face = Face(
-                    vertices=face_vertices,
-                    material=obj.current_material,
-                    line=line_strip,
-                )
-                obj.faces.append(face)
-                obj.out_lines.append(line)
+    A negative index counts back from the rows read so far, it is resolved
+    against this range's own counts and its slot recorded in face_relative.
+    """
+    buffer = obj.face_vertex_buffer
+    counts = (obj.num_positions, obj.num_texcoords, obj.num_normals)
+    for vertex in _find_face_vertices(rest):
+        for count, index in zip(counts, vertex):
+            if not index:
+                buffer.append(-1)
+                continue
+            i = int(index)
+            if i < 0:
+                obj.face_relative_buffer.append(len(buffer))
+                buffer.append(count + i)
             else:
-                obj.out_lines.append(line)
-
-    return obj
+                buffer.append(i - 1)
+
+
+def _parse_face(obj: OBJ, rest: bytes) -> None:
+    buffer = obj.face_vertex_buffer
+    if b"-" in rest:
+        _extend_relative_face(obj, rest)
+    else:
+        extend = buffer.extend
+        for v, vt, vn in _find_face_vertices(rest):
+            extend((int(v) - 1, int(vt) - 1 if vt else -1, int(vn) - 1 if vn else -1))
+    obj.face_offset_buffer.append(len(buffer) // 3)
+    obj.face_material_buffer.append(obj.current_material)
+
+
+def _finish_faces(obj: OBJ) -> None:
+    """Move the face data gathered while parsing into the face arrays."""
+    obj.face_vertices = np.array(obj.face_vertex_buffer, dtype=np.int32).reshape(-1, 3)
+    obj.face_offsets = np.array(obj.face_offset_buffer, dtype=np.int64)
+    obj.face_materials = np.array(obj.face_material_buffer, dtype=np.int32)
+    obj.face_relative = np.array(obj.face_relative_buffer, dtype=np.int64)
+    obj.face_vertex_buffer = array("i")
+    obj.face_offset_buffer = array("q", [0])
+    obj.face_material_buffer = array("i")
+    obj.face_relative_buffer = array("q")
+
+
+# keyed on the first token of a line, anything not listed is irrelevant to baking
+_OBJ_HANDLERS = {
+    b"v": _parse_position,
+    b"vt": _parse_texcoord,
+    b"vn": _parse_normal,
+    b"usemtl": _parse_usemtl,
+    b"f": _parse_face,
+}
+
+
+def _iter_lines(
+    file_path: str, start: int = 0, end: Optional[int] = None
+) -> Iterator[bytes]:
+    """Yield the raw lines of file_path in [start, end), read through a memory map."""
+    with open(file_path, "rb") as f:
+        # mmap refuses zero length files
+        if os.fstat(f.fileno()).st_size == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if end is None:
+                end = len(mm)
+            mm.seek(start)
+            # bound once, these run for every line of the file
+            readline = mm.readline
+            tell = mm.tell
+            while tell() < end:
+                yield readline()
+
+
+def _count_vertex_lines(file_path: str, start: int, end: int) -> Dict[bytes, int]:
+    """Count the v / vt / vn lines so the vertex arrays can be allocated up front."""
+    counts = {b"v": 0, b"vt": 0, b"vn": 0}
+    for line in _iter_lines(file_path, start, end):
+        key = line.strip().partition(b" ")[0]
+        if key in counts:
+            counts[key] += 1
+    return counts
+
+
+def _parse_range(file_path: str, start: int, end: int) -> OBJ:
+    """Parse the lines in bytes [start, end) of file_path.
+
+    Faces that come before the first usemtl of the range get material -1,
+    they continue whatever material was active where the range begins.
+    """
+    counts = _count_vertex_lines(file_path, start, end)
+    obj = OBJ(
+        positions=np.empty((counts[b"v"], 3), dtype=np.float32),
+        texcoords=np.empty((counts[b"vt"], 2), dtype=np.float32),
+        normals=np.empty((counts[b"vn"], 3), dtype=np.float32),
+    )
 
+    get_handler = _OBJ_HANDLERS.get
+    for line in _iter_lines(file_path, start, end):
+        key, _, rest = line.strip().partition(b" ")
+        handler = get_handler(key)
+        if handler:
+            handler(obj, rest)
 
-@dataclass
-class Material:
-    name: str
-    ambient: Optional[List[float]] = None  # Ka
-    diffuse: Optional[List[float]] = None  # Kd
-    specular: Optional[List[float]] = None  # Ks
-    shininess: Optional[float] = None  # Ns
-    alpha: Optional[float] = None  # d
-    illum: Optional[int] = None  # illum
-    map_Ka: Optional[str] = None  # ambient texture map
-    map_Kd: Optional[str] = None  # diffuse texture map
-    map_Ks: Optional[str] = None  # specular texture map
-    map_Ns: Optional[str] = None  # specular highlight map
-    map_d: Optional[str] = None  # alpha map
-    map_bump: Optional[str] = None  # bump map
-    extra_props: Dict[str, Union[str, float, List[float]]] = field(default_factory=dict)
-
+    _finish_faces(obj)
+    return obj
 
-@dataclass
-class MTL:
-    materials: List[Material] = field(default_factory=list)
-    out_lines: List[str] = field(default_factory=list)
-    current_material: Optional[Material] = None
 
+# below this many bytes per worker, starting processes costs more than it saves
+_MIN_CHUNK_SIZE = 1 << 24
+
+
+def _chunk_ranges(file_path: str, chunks: int) -> List[Tuple[int, int]]:
+    """Split file_path into chunks byte ranges of similar size that start on a line."""
+    size = os.path.getsize(file_path)
+    if chunks <= 1 or size == 0:
+        return [(0, size)]
+    bounds = [0]
+    with open(file_path, "rb") as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            for i in range(1, chunks):
+                newline = mm.find(b"\n", max(size * i // chunks, bounds[-1]))
+                if newline == -1:
+                    break
+                bounds.append(newline + 1)
+    bounds.append(size)
+    return list(zip(bounds, bounds[1:]))
+
+
+def _merge_chunks(chunks: List[OBJ]) -> OBJ:
+    """Join OBJs parsed from consecutive ranges of one file into a single OBJ."""
+    obj = OBJ(
+        positions=np.concatenate([c.positions for c in chunks]),
+        texcoords=np.concatenate([c.texcoords for c in chunks]),
+        normals=np.concatenate([c.normals for c in chunks]),
+    )
+    # positive face indices are absolute already, relative ones and the offsets and
+    # material ids are per chunk
+    face_vertices = []
+    face_offsets = [np.zeros(1, np.int64)]
+    face_materials = []
+    base = 0
+    # rows of positions, texcoords and normals in the chunks before this one
+    row_base = np.zeros(3, np.int32)
+    for chunk in chunks:
+        vertices = chunk.face_vertices
+        if len(chunk.face_relative):
+            vertices = vertices.copy()
+            flat = vertices.reshape(-1)
+            flat[chunk.face_relative] += row_base[chunk.face_relative % 3]
+        face_vertices.append(vertices)
+        row_base += (len(chunk.positions), len(chunk.texcoords), len(chunk.normals))
+        global_ids = [
+            obj.materials.setdefault(name, len(obj.materials))
+            for name in chunk.materials
+        ]
+        # the trailing entry is picked by -1, the material still active from the
+        # previous chunk
+        id_map = np.array(global_ids + [obj.current_material], dtype=np.int32)
+        face_materials.append(id_map[chunk.face_materials])
+        face_offsets.append(chunk.face_offsets[1:] + base)
+        base += int(chunk.face_offsets[-1])
+        if chunk.current_material >= 0:
+            obj.current_material = global_ids[chunk.current_material]
+    obj.face_vertices = np.concatenate(face_vertices)
+    obj.face_offsets = np.concatenate(face_offsets)
+    obj.face_materials = np.concatenate(face_materials)
+    obj.num_positions = len(obj.positions)
+    obj.num_texcoords = len(obj.texcoords)
+    obj.num_normals = len(obj.normals)
+    return obj
 
-def parse_mtl(file_path: str) -> MTL:
-    mtl = MTL()
 
-    with open(file_path, "r") as f:
-        for line in f:
-            line_strip = line.strip()
-            if not line_strip or line_strip.startswith("#"):
-                mtl.out_lines.append(line)
-                continue
+def parse_obj(file_path: str, jobs: Optional[int] = None) -> OBJ:
+    """Parse file_path, splitting large files over up to jobs worker processes."""
+    jobs = jobs or os.cpu_count() or 1
+    chunks = min(jobs, max(1, os.path.getsize(file_path) // _MIN_CHUNK_SIZE))
+    ranges = _chunk_ranges(file_path, chunks)
+    if len(ranges) == 1:
+        return _parse_range(file_path, *ranges[0])
+    with ProcessPoolExecutor(len(ranges)) as pool:
+        parts = list(pool.map(_parse_range, [file_path] * len(ranges), *zip(*ranges)))
+    return _merge_chunks(parts)
+
+
+CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "bake_vertex_colors")
+# bump whenever what gets cached changes shape, so stale entries are never loaded
+_CACHE_VERSION = 4
+
+
+def _cache_path(path: str, suffix: str) -> str:
+    """Cache file for path, keyed on its real location, mtime and size.
+
+    The name starts with a hash of the location alone, so the entries left
+    behind by older versions of the same file can be found and evicted.
+    """
+    real_path = os.path.realpath(path)
+    st = os.stat(real_path)
+    path_key = hashlib.blake2b(real_path.encode(), digest_size=16).hexdigest()
+    state = f"{_CACHE_VERSION}:{st.st_mtime_ns}:{st.st_size}"
+    state_key = hashlib.blake2b(state.encode(), digest_size=16).hexdigest()
+    return os.path.join(CACHE_DIR, f"{path_key}-{state_key}{suffix}")
+
+
+def _evict_stale(cache_path: str) -> None:
+    """Remove the other entries cached for the same file and suffix."""
+    name = os.path.basename(cache_path)
+    prefix = name.split("-", 1)[0] + "-"
+    suffix = os.path.splitext(name)[1]
+    for entry in os.listdir(CACHE_DIR):
+        if entry != name and entry.startswith(prefix) and entry.endswith(suffix):
+            try:
+                os.remove(os.path.join(CACHE_DIR, entry))
+            except FileNotFoundError:  # another run evicted it first
+                pass
+
+
+# set after the first failed write so an unwritable cache dir warns once, not per entry
+_cache_write_failed = False
+
+
+def _write_cache(cache_path: str, write: Callable[[BinaryIO], None]) -> None:
+    """Write a cache entry through a temp file so readers never see a partial one.
+
+    The cache is only an optimisation, if it cannot be written the bake goes on
+    without it.
+    """
+    global _cache_write_failed
+    if _cache_write_failed:
+        return
+    tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        with open(tmp_path, "wb") as f:
+            write(f)
+        os.replace(tmp_path, cache_path)
+        _evict_stale(cache_path)
+    except OSError as e:
+        print(f"[WARN] Could not write to cache, continuing without it: {e}")
+        _cache_write_failed = True
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+
+
+def load_obj(
+    file_path: str, use_cache: bool = False, jobs: Optional[int] = None
+) -> OBJ:
+    """parse_obj, reusing the result of an earlier run while the file is unchanged."""
+    if not use_cache:
+        return parse_obj(file_path, jobs)
+    cache_path = _cache_path(file_path, ".pickle")
+    if os.path.isfile(cache_path):
+        try:
+            with open(cache_path, "rb") as f:
+                obj = pickle.load(f)
+            if isinstance(obj, OBJ):
+                return obj
+        # a corrupt entry can fail in many ways, re-parsing fixes all of them
+        except Exception as e:
+            print(f"[WARN] Ignoring unreadable cache entry {cache_path}: {e}")
+    obj = parse_obj(file_path, jobs)
+    _write_cache(cache_path, lambda f: pickle.dump(obj, f, pickle.HIGHEST_PROTOCOL))
+    return obj
 
-            parts = line_strip.split(None, 1)
-            key = parts[0].lower()
-            value = parts[1] if len(parts) > 1 else None
-
-            assert value
-
-            if key == "newmtl":
-                mat = Material(name=value)
-                mtl.materials.append(mat)
-                mtl.current_material = mat
-                mtl.out_lines.append(line)
-            elif mtl.current_material:
-                if key == "ka":
-                    mtl.current_material.ambient = list(map(float, value.split()))
-                elif key == "kd":
-                    mtl.current_material.diffuse = list(map(float, value.split()))
-                elif key == "ks":
-                    mtl.current_material.specular = list(map(float, value.split()))
-                elif key == "ns":
-                    mtl.current_material.shininess = float(value)
-                elif key == "d":
-                    mtl.current_material.alpha = float(value)
-                elif key == "illum":
-                    mtl.current_material.illum = int(value)
-                elif key == "map_ka":
-                    mtl.current_material.map_Ka = value
-                elif key == "map_kd":
-                    mtl.current_material.map_Kd = value
-                elif key == "map_ks":
-                    mtl.current_material.map_Ks = value
-                elif key == "map_ns":
-                    mtl.current_material.map_Ns = value
-                elif key == "map_d":
-                    mtl.current_material.map_d = value
-                elif key in ("map_bump", "bump"):
-                    mtl.current_material.map_bump = value
-                else:
-                    # store unknown/extra properties
-                    mtl.current_material.extra_props[key] = value
 
-                mtl.out_lines.append(line)
-            else:
-                # lines before any 'newmtl' are kept for reference
-                mtl.out_lines.append(line)
+# decoded textures keyed by real path, materials often share the same image file
+_tex_cache: Dict[str, np.ndarray] = {}
 
-    return mtl
 
+def load_texture(path: str, use_cache: bool = False) -> np.ndarray:
+    """Decode the image at path into an (h, w, 3) uint8 array, once per file.
 
-def sample_texture(image, u, v):
-    w, h = image.size
-    u_wrapped = u % 1.0
-    v_wrapped = v % 1.0
-    px = min(int(u_wrapped * w), w - 1)
-    py = min(int((1.0 - v_wrapped) * h), h - 1)
-    r, g, b = image.getpixel((px, py))[:3]
-    return r / 255.0, g / 255.0, b / 255.0
+    With use_cache the decoded array is also kept on disk and memory mapped
+    back on later runs instead of decoding the image again.
+    """
+    key = os.path.realpath(path)
+    if key in _tex_cache:
+        return _tex_cache[key]
+    cache_path = _cache_path(key, ".npy") if use_cache else None
+    tex_np = None
+    if cache_path and os.path.isfile(cache_path):
+        try:
+            tex_np = np.load(cache_path, mmap_mode="r")
+            if tex_np.dtype != np.uint8 or tex_np.ndim != 3 or tex_np.shape[2] != 3:
+                raise ValueError(
+                    f"unexpected texture array {tex_np.dtype} {tex_np.shape}"
+                )
+        except (OSError, ValueError) as e:
+            print(f"[WARN] Ignoring unreadable cache entry {cache_path}: {e}")
+            tex_np = None
+    if tex_np is None:
+        image = Image.open(key)
+        if image.mode != "RGB":
+            image = image.convert("RGB")
+        # row major (h, w, 3) with packed texels, the samplers' gathers rely on this
+        # layout
+        tex_np = np.ascontiguousarray(np.asarray(image, dtype=np.uint8))
+        if cache_path:
+            _write_cache(cache_path, lambda f: np.save(f, tex_np))
+    _tex_cache[key] = tex_np
+    return tex_np
+
+
+# averaged colors keyed by real texture path
+_dominant_color_cache: Dict[str, np.ndarray] = {}
+
+
+def dominant_color(path: str, use_cache: bool = False) -> np.ndarray:
+    """Average RGB of the texture at path, estimated from a grid of ~50x50 texels."""
+    key = os.path.realpath(path)
+    if key not in _dominant_color_cache:
+        tex_np = load_texture(key, use_cache)
+        h, w = tex_np.shape[:2]
+        grid = tex_np[:: max(1, h // 50), :: max(1, w // 50)].reshape(-1, 3)
+        _dominant_color_cache[key] = np.rint(grid.mean(axis=0)).astype(np.uint8)
+    return _dominant_color_cache[key]
+
+
+# both samplers filter bilinearly between the 4 texels around (u, v), texel centres
+# sit at +0.5 and the neighbours wrap around the edges just like the uvs repeat
+
+if njit is not None:
+
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _sample_texture_kernel(tex_np, uvs, out):
+        h, w = tex_np.shape[0], tex_np.shape[1]
+        for i in prange(uvs.shape[0]):
+            x = (uvs[i, 0] - math.floor(uvs[i, 0])) * w - 0.5
+            y = (1.0 - (uvs[i, 1] - math.floor(uvs[i, 1]))) * h - 0.5
+            x_floor = math.floor(x)
+            y_floor = math.floor(y)
+            fx = x - x_floor
+            fy = y - y_floor
+            x0 = x_floor % w
+            y0 = y_floor % h
+            x1 = (x0 + 1) % w
+            y1 = (y0 + 1) % h
+            for c in range(3):
+                top = tex_np[y0, x0, c] * (1.0 - fx) + tex_np[y0, x1, c] * fx
+                bottom = tex_np[y1, x0, c] * (1.0 - fx) + tex_np[y1, x1, c] * fx
+                out[i, c] = np.uint8(top * (1.0 - fy) + bottom * fy + 0.5)
+
+else:
+    _sample_texture_kernel = None
+
+
+def sample_texture(tex_np: np.ndarray, uvs: np.ndarray) -> np.ndarray:
+    """Bilinear lookup of every (u, v) row of uvs into an (h, w, 3) uint8 texture."""
+    if _sample_texture_kernel is not None:
+        out = np.empty((len(uvs), 3), dtype=np.uint8)
+        # asarray drops the memmap subclass of disk cached textures, numba only takes
+        # ndarrays
+        _sample_texture_kernel(np.asarray(tex_np), uvs, out)
+        return out
+    h, w = tex_np.shape[:2]
+    # float64 and the same wrap as the numba kernel, so the colors do not depend on
+    # numba
+    u = uvs[:, 0].astype(np.float64)
+    v = uvs[:, 1].astype(np.float64)
+    x = (u - np.floor(u)) * w - 0.5
+    y = (1.0 - (v - np.floor(v))) * h - 0.5
+    x_floor = np.floor(x)
+    y_floor = np.floor(y)
+    fx = (x - x_floor)[:, None]
+    fy = (y - y_floor)[:, None]
+    x0 = x_floor.astype(np.int64) % w
+    y0 = y_floor.astype(np.int64) % h
+    x1 = (x0 + 1) % w
+    y1 = (y0 + 1) % h
+    top = tex_np[y0, x0] * (1.0 - fx) + tex_np[y0, x1] * fx
+    bottom = tex_np[y1, x0] * (1.0 - fx) + tex_np[y1, x1] * fx
+    # round half up like the numba kernel, rint's half-to-even would differ on texel
+    # aligned uvs
+    return (top * (1.0 - fy) + bottom * fy + 0.5).astype(np.uint8)
 
 
 def parse_args():
@@ -206,6 +471,17 @@ def parse_args():
     p.add_argument(
         "--out", help="Optional output OBJ file. Default = <objname>_baked.obj"
     )
+    p.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        help="Worker processes used to parse large OBJ files. Default = CPU count",
+    )
+    p.add_argument(
+        "--cache",
+        action="store_true",
+        help=f"Keep the parsed OBJ and decoded textures in {CACHE_DIR} for next runs",
+    )
     return p.parse_args()
 
 
@@ -225,17 +501,81 @@ def parse_mtl_file(mtl_path) -> Dict[str, str]:
 
     mat_to_tex = {}
     current_mat = None
-    with open(mtl_path, "r") as f:
+    with open(mtl_path, "rb") as f:
         for line in f:
-            line = line.strip()
-            if line.lower().startswith("newmtl"):
-                current_mat = line.split(None, 1)[1]
-            elif current_mat and line.lower().startswith("map_kd"):
-                tex = line.split(None, 1)[1]
-                mat_to_tex[current_mat] = tex
+            # baking only needs newmtl and map_Kd, every other statement is skipped
+            # unparsed
+            lower = line.lower()
+            if b"newmtl" not in lower and b"map_" not in lower:
+                continue
+            parts = line.split(None, 1)
+            if len(parts) < 2:
+                continue
+            key = parts[0].lower()
+            if key == b"newmtl":
+                current_mat = parts[1].strip().decode()
+            elif current_mat and key == b"map_kd":
+                mat_to_tex[current_mat] = parts[1].strip().decode()
     return mat_to_tex
 
 
+# colors are baked as uint8, written back as the 0-1 floats OBJ readers expect. 3
+# decimals are enough for the 8 bit value to survive a round trip, spacing between
+# levels is 1/255
+_CHANNEL_TEXT = [b"%.3f" % (i / 255.0) for i in range(256)]
+
+# lines gathered before each write, keeps memory flat while avoiding a write per line
+_WRITE_BATCH_LINES = 1 << 16
+
+
+def write_baked_obj(obj_in: str, obj_out: str, colors: np.ndarray) -> None:
+    """Stream obj_in into obj_out, appending its baked color to every v line.
+
+    The position text is copied as written, so neither precision, an optional
+    w nor the line ending of the input is lost.
+
+    The lines go to a temp file next to obj_out that replaces it at the end,
+    so obj_out may be obj_in itself.
+    """
+    v_line = b"%s %s %s %s%s"
+    channel = _CHANNEL_TEXT
+    position = 0
+    # only one batch of colors is ever held as Python ints
+    batch_start = 0
+    rgb: List[List[int]] = []
+    parts: List[bytes] = []
+    append = parts.append
+    tmp_path = f"{obj_out}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, "wb", buffering=1 << 20) as f:
+            for line in _iter_lines(obj_in):
+                if line.strip().partition(b" ")[0] == b"v":
+                    i = position - batch_start
+                    if i == len(rgb):
+                        batch_start = position
+                        rgb = colors[position : position + _WRITE_BATCH_LINES].tolist()
+                        i = 0
+                    r, g, b = rgb[i]
+                    body = line.rstrip(b"\r\n")
+                    tokens = body.split()
+                    # keep a w coordinate, but not the colors of an already baked file
+                    head = b" ".join(tokens[:5] if len(tokens) == 5 else tokens[:4])
+                    ending = line[len(body) :]
+                    append(v_line % (head, channel[r], channel[g], channel[b], ending))
+                    position += 1
+                else:
+                    append(line)
+                if len(parts) >= _WRITE_BATCH_LINES:
+                    f.write(b"".join(parts))
+                    parts.clear()
+            f.write(b"".join(parts))
+        os.replace(tmp_path, obj_out)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
 def main():
     args = parse_args()
     obj_out = args.out if args.out else os.path.splitext(args.obj_in)[0] + "_baked.obj"
@@ -244,9 +584,54 @@ def main():
 
     mtl_path = args.mtl if args.mtl else os.path.splitext(args.obj_in)[0] + ".mtl"
 
-    obj = parse_obj(args.obj_in)
-    mtl = parse_mtl(mtl_path)
-
+    obj = load_obj(args.obj_in, use_cache=args.cache, jobs=args.jobs)
+    mat_to_tex = parse_mtl_file(mtl_path)
+    mtl_dir = os.path.dirname(mtl_path)
+
+    tex_paths: Dict[str, str] = {}
+    textures: Dict[str, np.ndarray] = {}
+    for mat, tex in mat_to_tex.items():
+        tex_path = os.path.join(mtl_dir, tex)
+        if not os.path.isfile(tex_path):
+            print(f"[WARN] Texture for material '{mat}' not found: {tex_path}")
+            continue
+        tex_paths[mat] = tex_path
+        textures[mat] = load_texture(tex_path, use_cache=args.cache)
+
+    # every face vertex is sampled against its face's texture, one gather per texture
+    fv_mat = np.repeat(obj.face_materials, np.diff(obj.face_offsets))
+    pos_idx = obj.face_vertices[:, 0]
+    vt_idx = obj.face_vertices[:, 1]
+    fv_colors = np.zeros((len(pos_idx), 3), dtype=np.uint8)
+    baked = np.zeros(len(pos_idx), dtype=bool)
+    # group the face vertices by material once, each material is then one contiguous
+    # slice
+    order = np.argsort(fv_mat, kind="stable")
+    sorted_mat = fv_mat[order]
+    for mat, mat_id in obj.materials.items():
+        tex_np = textures.get(mat)
+        if tex_np is None:
+            continue
+        start, end = np.searchsorted(sorted_mat, [mat_id, mat_id + 1])
+        members = order[start:end]
+        mat_vt = vt_idx[members]
+        has_uv = mat_vt >= 0
+        # the sample only depends on the texcoord, so each one shared between faces is
+        # sampled once
+        unique_vt, inverse = np.unique(mat_vt[has_uv], return_inverse=True)
+        samples = sample_texture(tex_np, obj.texcoords[unique_vt])
+        fv_colors[members[has_uv]] = samples[inverse]
+        # without a texcoord the texture's overall color beats leaving the vertex black
+        no_uv = members[~has_uv]
+        if len(no_uv):
+            fv_colors[no_uv] = dominant_color(tex_paths[mat], use_cache=args.cache)
+        baked[members] = True
+
+    # scattering in file order keeps "last face wins" for positions shared between faces
+    colors = np.zeros((len(obj.positions), 3), dtype=np.uint8)
+    colors[pos_idx[baked]] = fv_colors[baked]
+
+    write_baked_obj(args.obj_in, obj_out, colors)
     print(f"[DONE] Wrote baked OBJ → {obj_out}")
 
 